@@ -1,17 +1,47 @@
 import os
+import sys
 import asyncio
 import json
 import time
 import base64
 import re
+import copy
+import itertools
+import hashlib
+import functools
+import inspect
+import httpx
 import openai
+import importlib.util
 import argparse
+import logging
+import logging.handlers
+import queue
+from collections import OrderedDict, deque
 from datetime import datetime
 from agents import Agent, Runner, ComputerTool, ModelSettings
 from agents.computer import AsyncComputer, Environment, Button
-from pydantic import BaseModel, Field, create_model
-from typing import List, Optional, Dict, Any, Tuple, Literal, Union, Type
+from pydantic import BaseModel, Field, ValidationError, create_model
+from typing import List, Optional, Dict, Any, Tuple, Literal, Union, Type, get_args
 from playwright.async_api import async_playwright, Browser, Page
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+try:
+    import uvloop  # Faster event loop for the Playwright/OpenAI async workload
+except ImportError:
+    uvloop = None
+
+try:
+    import orjson  # Faster JSON parsing/serialization for agent output and saved results
+except ImportError:
+    orjson = None
+
+# Per-turn diagnostics go through logging so they cost nothing unless enabled
+# (set AGENT_LOG_LEVEL=DEBUG to see them)
+log = logging.getLogger("agent")
+
+# One line per browser action; shown by default, like the rest of the console output
+action_log = logging.getLogger("agent.actions")
 
 # Check and print API key for debugging (masking most of it)
 api_key = os.environ.get("OPENAI_API_KEY", "")
@@ -22,51 +52,364 @@ else:
     print("WARNING: No OpenAI API key found in environment variables!")
 
 
+# JSON schema for the research task configuration produced by the prompt LLM
+_RESEARCH_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "task_name": {"type": "string", "description": "Short name for this research task"},
+        "search_terms": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Keywords to search for"
+        },
+        "target_websites": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Optional specific websites to check"
+        },
+        "data_to_extract": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "field_name": {"type": "string"},
+                    "field_type": {"type": "string", "enum": ["string", "number", "array"]},
+                    "description": {"type": "string"}
+                }
+            },
+            "description": "Fields to extract from results"
+        },
+        "success_criteria": {"type": "string", "description": "When to stop searching"},
+        "example_output": {"type": "object", "description": "Example of expected output"}
+    },
+    "required": ["task_name", "search_terms", "data_to_extract", "success_criteria", "example_output"]
+}
+
+
+# Model used to turn a user query into a research task configuration
+_PROMPT_MODEL = "gpt-4o-mini"
+
+# Exact-match cache of parsed LLM responses, keyed on a hash of (model, prompt)
+_LLM_CACHE_SIZE = 128
+_llm_response_cache: "OrderedDict[str, dict]" = OrderedDict()
+
+
+def _llm_cache_key(model: str, prompt: str) -> str:
+    """Return a stable cache key for a model/prompt pair."""
+    return hashlib.blake2b(f"{model}\0{prompt}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+# Query templates that can be turned into a task configuration without an LLM call.
+# Price templates need an explicit shopping signal ("buy", "shop for", "deals"), since
+# "prices"/"costs" alone can't tell "egg prices" from "stock prices", and list templates
+# need a count ("top 10 ..."). Each pattern captures the thing being researched as
+# "topic", and a match is only used when that topic reads like a plain retail noun
+# phrase; anything ambiguous (a store, a place, a purpose, several constraints) goes
+# to the LLM.
+_QUERY_PREFIX = r"^(?:(?:find|get|check|search for|look up|show me|what (?:is|are))\s+)?(?:the\s+)?"
+_TOPIC = r"(?P<topic>[\w\s'&-]+?)"
+_PRICE_QUALIFIER = (
+    r"(?:\s+(?P<qualifier>(?:under|below|less than)\s+\$?\d[\d,.]*(?:\s*(?:dollars|usd))?))?"
+)
+_TEMPLATE_PATTERNS = [
+    ("price", re.compile(
+        _QUERY_PREFIX + r"(?:best\s+)?deals?\s+(?:on|for)\s+" + _TOPIC + _PRICE_QUALIFIER + r"$",
+        re.IGNORECASE)),
+    ("price", re.compile(
+        _QUERY_PREFIX + _TOPIC + r"\s+deals?" + _PRICE_QUALIFIER + r"$",
+        re.IGNORECASE)),
+    ("price", re.compile(
+        r"^(?:where (?:can i|to) buy|buy|shop for)\s+" + _TOPIC + _PRICE_QUALIFIER + r"(?:\s+online)?$",
+        re.IGNORECASE)),
+    ("list", re.compile(
+        r"^(?:(?:find|get|show me|list|what (?:is|are))\s+)?(?:the\s+)?"
+        r"(?P<lead>(?:top|best)\s+\d+)\s+" + _TOPIC + r"$",
+        re.IGNORECASE)),
+]
+
+# Words that turn a topic into a sentence, tie it to a place, store, time or purpose,
+# or name something that is priced but not bought off a shop shelf
+_NON_PRODUCT_WORDS = frozenset((
+    "to", "in", "at", "on", "of", "for", "from", "near", "with", "by", "about", "vs", "versus",
+    "how", "why", "when", "where", "who", "which", "i", "me", "my", "you", "your",
+    "is", "are", "do", "does", "can", "should",
+    "today", "tonight", "tomorrow", "now", "week", "month", "year",
+    "stock", "stocks", "share", "shares", "crypto", "bitcoin", "house", "houses", "home", "homes",
+    "rent", "gas", "insurance", "practices",
+))
+_NON_PRODUCT_QUERY_RE = re.compile(r"\bcost\s+of\s+living\b", re.IGNORECASE)
+_MAX_TOPIC_WORDS = 5
+
+
+def _is_product_phrase(topic: str) -> bool:
+    """Return True if a topic is a short noun phrase with no place, store, time or purpose."""
+    words = topic.lower().split()
+    return 0 < len(words) <= _MAX_TOPIC_WORDS and _NON_PRODUCT_WORDS.isdisjoint(words)
+
+
+def _match_template(user_query: str) -> Optional[Tuple[str, str, Optional[str]]]:
+    """Return the (intent, topic, price qualifier) of the template a query fits, or None."""
+    query = " ".join(user_query.strip().rstrip("?.!").split())
+    if _NON_PRODUCT_QUERY_RE.search(query):
+        return None
+    for intent, pattern in _TEMPLATE_PATTERNS:
+        match = pattern.match(query)
+        if not match or not _is_product_phrase(match.group("topic")):
+            continue
+        groups = match.groupdict()
+        topic = " ".join(part.strip() for part in (groups.get("lead"), groups["topic"]) if part)
+        return intent, topic, groups.get("qualifier")
+    return None
+
+
+def _price_task_config(topic: str, qualifier: Optional[str] = None) -> dict:
+    """Task configuration for 'buy X' / 'X deals' style queries"""
+    constrained = f"{topic} {qualifier}" if qualifier else topic
+    return {
+        "task_name": f"Find {topic} prices {qualifier}" if qualifier else f"Find {topic} prices",
+        "search_terms": [constrained, f"{topic} prices", f"buy {constrained}"],
+        "target_websites": [],
+        "data_to_extract": [
+            {"field_name": "name", "field_type": "string", "description": "Product name"},
+            {"field_name": "price", "field_type": "string", "description": "Listed price"},
+            {"field_name": "details", "field_type": "string", "description": "Key product details"}
+        ],
+        "success_criteria": "STOP searching after finding FIRST item with a price",
+        "example_output": {"name": topic, "price": "$0.00", "details": "Product details"}
+    }
+
+
+def _list_task_config(topic: str, qualifier: Optional[str] = None) -> dict:
+    """Task configuration for 'top N X' / 'best N X' style queries (lists take no qualifier)"""
+    return {
+        "task_name": f"Find {topic}",
+        "search_terms": [topic, f"{topic} reviews"],
+        "target_websites": [],
+        "data_to_extract": [
+            {"field_name": "name", "field_type": "string", "description": "Name or title"},
+            {"field_name": "details", "field_type": "string", "description": "Key details"},
+            {"field_name": "rating", "field_type": "string", "description": "Rating if visible"}
+        ],
+        "success_criteria": "STOP and extract from FIRST page showing relevant items",
+        "example_output": {"name": "Example item", "details": "Key details", "rating": "N/A"}
+    }
+
+
+_TEMPLATE_BUILDERS = {
+    "price": _price_task_config,
+    "list": _list_task_config,
+}
+
+
+# Output models built by PromptGenerator._create_dynamic_model, keyed on the task name
+# and the (name, type, description) of every extracted field
+_MODEL_CACHE: Dict[tuple, Type[BaseModel]] = {}
+
+
+# One connection pool shared by every PromptGenerator, so retries and batch polling
+# reuse warm TCP/TLS connections. HTTP/2 is used when the h2 package is installed.
+# Keep-alive connections belong to the event loop that opened them, so the client is
+# created on first use and closed by _close_http_client() when that loop's run ends.
+_HTTPX: Optional[httpx.AsyncClient] = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client, creating it if there is none open."""
+    global _HTTPX
+    if _HTTPX is None or _HTTPX.is_closed:
+        _HTTPX = httpx.AsyncClient(
+            http2=importlib.util.find_spec("h2") is not None,
+            timeout=60.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=40)
+        )
+    return _HTTPX
+
+
+async def _close_http_client() -> None:
+    """Close the shared HTTP client and its pooled connections."""
+    global _HTTPX
+    if _HTTPX is not None:
+        await _HTTPX.aclose()
+        _HTTPX = None
+
+
+def _cache_task_config(cache_key: str, task_config: dict) -> None:
+    """Store a parsed task configuration, evicting the least recently used entry."""
+    _llm_response_cache[cache_key] = copy.deepcopy(task_config)
+    _llm_response_cache.move_to_end(cache_key)
+    if len(_llm_response_cache) > _LLM_CACHE_SIZE:
+        _llm_response_cache.popitem(last=False)
+
+
+# System prompt for the computer-use agent. It is resent on every model turn, so
+# keep it short: each rule is stated once.
+_AGENT_INSTRUCTIONS_TEMPLATE = """You are a research agent performing: {task_name}
+
+SEARCH (you start on duckduckgo.com):
+1. Click inside the wide search box in the center of the page (placeholder "Search without being tracked"), not the logo.
+2. Type: {first_term}
+3. Press Enter, then click a relevant result (official stores or shopping results).
+Search terms to try: {search_terms}
+Work within the single browser page provided. If you hit a CAPTCHA or verification, go back to the results and pick a different link.
+
+DATA TO EXTRACT for each item:
+{fields}
+
+SUCCESS CRITERIA: {criteria}
+
+EXTRACTION RULES:
+- STOP and extract as soon as the screen shows ANY relevant item: a price ($19.99, £50, €30), a product name with a price, "Add to cart"/"Buy now" buttons, or a product listing/grid. Do not navigate further.
+- Extract only what is visible on screen; never invent data. Partial data is fine: use "N/A" for fields you cannot see. One item with a name and price meets the goal.
+- Turn budget is 20. Turns 1-5: search and navigate. Turn 6+: extract and return. Turn 10+: return whatever you have immediately.
+
+RESPONSE FORMAT (JSON):
+{{
+  "found_items": [
+    {{
+      "title": "Name/title of the item",
+      "position": "Position on page (e.g., '1st result')",
+      "url": "Current page URL",
+      "snippet": "Brief description",
+{field_format}
+    }}
+  ],
+  "search_summary": "Summary of what was found",
+  "search_complete": true/false
+}}
+"""
+
+
+# Generated task configurations persisted across processes, one JSON file per query
+_TASK_CACHE_DIR = os.environ.get("AGENT_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "agent"))
+
+
+# Fully built (instructions, output model, task config) results for queries seen in this process
+# (least recently used first, bounded like the LLM response cache)
+_RESEARCH_SETUP_CACHE: "OrderedDict[str, Tuple[str, Type[BaseModel], dict]]" = OrderedDict()
+
+
+def _query_cache_key(user_query: str) -> str:
+    """Collapse whitespace so trivially different spellings of a query share cache entries."""
+    return " ".join(user_query.split())
+
+
+def _task_cache_path(user_query: str, prompt_version: str) -> str:
+    """Return the on-disk cache file for a user query under the given prompt version."""
+    return os.path.join(_TASK_CACHE_DIR, f"{_llm_cache_key(prompt_version, _query_cache_key(user_query))}.json")
+
+
+def _is_valid_task_config(task_config) -> bool:
+    """Return True if a task configuration has every key the agent setup reads."""
+    if not isinstance(task_config, dict) or not all(key in task_config for key in _RESEARCH_SCHEMA["required"]):
+        return False
+    fields = task_config["data_to_extract"]
+    return isinstance(fields, list) and all(
+        isinstance(field, dict) and all(key in field for key in ("field_name", "field_type", "description"))
+        for field in fields
+    )
+
+
+def _load_cached_task_config(user_query: str, prompt_version: str) -> Optional[dict]:
+    """Load a previously generated task configuration for this query, if any."""
+    try:
+        with open(_task_cache_path(user_query, prompt_version)) as f:
+            task_config = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        log.warning("Ignoring unreadable task cache entry: %s", e)
+        return None
+
+    if not _is_valid_task_config(task_config):
+        log.warning("Ignoring malformed task cache entry for query: %s", user_query)
+        return None
+    return task_config
+
+
+def _store_task_config(user_query: str, prompt_version: str, task_config: dict) -> None:
+    """Persist a generated task configuration so later runs can skip the LLM."""
+    path = _task_cache_path(user_query, prompt_version)
+    try:
+        os.makedirs(_TASK_CACHE_DIR, exist_ok=True)
+        # Write to a temp file first so a crash never leaves a half-written entry
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(task_config, f, indent=2)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        log.warning("Could not write task cache entry %s: %s", path, e)
+
+
 class PromptGenerator:
     """Generate dynamic instructions for the computer-use agent"""
 
     def __init__(self, openai_api_key: str = None):
         # Use provided key or fall back to environment variable
         api_key = openai_api_key or os.environ.get("OPENAI_API_KEY", "")
-        self.client = openai.OpenAI(api_key=api_key)
+        self.client = openai.AsyncOpenAI(api_key=api_key, http_client=_get_http_client())
+
+        # The schema never changes, so serialize it and build the system message once
+        self._schema_json = json.dumps(_RESEARCH_SCHEMA, indent=4)
+        self._system_msg = (
+            "You MUST produce output that adheres to the following JSON schema:\n\n"
+            f"{self._schema_json}. Respond with the JSON object only."
+        )
+
+        # Disk cache entries are keyed on the model, system message and task prompt
+        # template, so editing any of them invalidates configs generated by the old ones
+        self._prompt_version = _llm_cache_key(
+            _PROMPT_MODEL, f"{self._system_msg}\0{self._build_task_prompt('')}"
+        )
 
     async def generate_research_instructions(self, user_query: str) -> Tuple[str, Type[BaseModel], dict]:
         """Generate instructions and output model from user query"""
 
-        # Define the schema for our research task
-        schema = {
-            "type": "object",
-            "properties": {
-                "task_name": {"type": "string", "description": "Short name for this research task"},
-                "search_terms": {
-                    "type": "array",
-                    "items": {"type": "string"},
-                    "description": "Keywords to search for"
-                },
-                "target_websites": {
-                    "type": "array",
-                    "items": {"type": "string"},
-                    "description": "Optional specific websites to check"
-                },
-                "data_to_extract": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "properties": {
-                            "field_name": {"type": "string"},
-                            "field_type": {"type": "string", "enum": ["string", "number", "array"]},
-                            "description": {"type": "string"}
-                        }
-                    },
-                    "description": "Fields to extract from results"
-                },
-                "success_criteria": {"type": "string", "description": "When to stop searching"},
-                "example_output": {"type": "object", "description": "Example of expected output"}
-            },
-            "required": ["task_name", "search_terms", "data_to_extract", "success_criteria", "example_output"]
-        }
+        # Repeat queries in one process reuse the already built result
+        setup_key = _query_cache_key(user_query)
+        cached_setup = _RESEARCH_SETUP_CACHE.get(setup_key)
+        if cached_setup is not None:
+            _RESEARCH_SETUP_CACHE.move_to_end(setup_key)
+            instructions, output_model, task_config = cached_setup
+            return instructions, output_model, copy.deepcopy(task_config)
+
+        # Reuse a configuration generated by an earlier run for the same query
+        task_config = _load_cached_task_config(user_query, self._prompt_version)
+        if task_config is not None:
+            log.info("Loaded cached task configuration: %s", task_config['task_name'])
+        else:
+            # Simple queries get a templated configuration; everything else goes to the LLM
+            task_config = self._try_template_match(user_query)
+            if task_config is None:
+                # Call LLM with schema enforcement
+                task_config = await self._call_llm(self._build_task_prompt(user_query))
+                if _is_valid_task_config(task_config):
+                    _store_task_config(user_query, self._prompt_version, task_config)
 
-        prompt = f"""
+        # Generate Pydantic model dynamically based on the task
+        output_model = self._create_dynamic_model(task_config['data_to_extract'], task_config['task_name'])
+
+        # Generate agent instructions
+        instructions = self._generate_agent_instructions(task_config)
+
+        _RESEARCH_SETUP_CACHE[setup_key] = (instructions, output_model, copy.deepcopy(task_config))
+        if len(_RESEARCH_SETUP_CACHE) > _LLM_CACHE_SIZE:
+            _RESEARCH_SETUP_CACHE.popitem(last=False)
+        return instructions, output_model, task_config
+
+    def _try_template_match(self, user_query: str) -> Optional[dict]:
+        """Return a task configuration for a templated query, or None if no template fits"""
+        match = _match_template(user_query)
+        if match is None:
+            return None
+        intent, topic, qualifier = match
+        task_config = _TEMPLATE_BUILDERS[intent](topic, qualifier)
+        print(f"Matched '{intent}' template, skipping LLM: {task_config['task_name']}")
+        return task_config
+
+    def _build_task_prompt(self, user_query: str) -> str:
+        """Build the user prompt asking the LLM for a research task configuration"""
+
+        return f"""
         Based on this user request: "{user_query}"
 
         Generate a research task configuration that includes:
@@ -112,63 +455,160 @@ class PromptGenerator:
         - If the query mentions reviews/ratings, make them optional string fields
         """
 
-        # Call LLM with schema enforcement
-        task_config = await self._call_llm(schema, prompt)
-
-        # Generate Pydantic model dynamically based on the task
-        output_model = self._create_dynamic_model(task_config['data_to_extract'], task_config['task_name'])
-
-        # Generate agent instructions
-        instructions = self._generate_agent_instructions(task_config)
-
-        return instructions, output_model, task_config
+    def _chat_request(self, prompt: str) -> dict:
+        """Return the chat completion request body for a task prompt"""
+        return {
+            "model": _PROMPT_MODEL,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": self._system_msg
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0,  # Deterministic output so cached configurations stay valid
+            # JSON mode guarantees a parseable object, so no markdown extraction is needed
+            "response_format": {"type": "json_object"}
+        }
 
-    async def _call_llm(self, schema: dict, prompt: str):
+    async def _call_llm(self, prompt: str):
         """Call OpenAI with schema enforcement (this is our prompt_llm_for_json!)"""
 
+        # Identical prompts skip the OpenAI round-trip entirely
+        cache_key = _llm_cache_key(_PROMPT_MODEL, prompt)
+        cached = _llm_response_cache.get(cache_key)
+        if cached is not None:
+            _llm_response_cache.move_to_end(cache_key)
+            log.info("Using cached task configuration: %s", cached['task_name'])
+            return copy.deepcopy(cached)
+
         for i in range(3):
             try:
-                response = self.client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": f"You MUST produce output that adheres to the following JSON schema:\n\n{json.dumps(schema, indent=4)}. Output your JSON in a ```json markdown block."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    temperature=0.3  # Lowered for more consistent results
-                )
-
-                response_text = response.choices[0].message.content
-
-                # Extract JSON from markdown
-                if "```json" in response_text:
-                    start = response_text.find("```json")
-                    end = response_text.rfind("```")
-                    response_text = response_text[start + 7:end].strip()
+                response = await self.client.chat.completions.create(**self._chat_request(prompt))
 
-                parsed = json.loads(response_text)
+                parsed = json.loads(response.choices[0].message.content)
                 # DEBUG: Show the generated JSON
-                print("\n📋 Generated Task Configuration (JSON):")
-                print("=" * 60)
-                print(json.dumps(parsed, indent=2))
-                print("=" * 60)
-                print(f"Generated task configuration: {parsed['task_name']}")
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug("Generated task configuration (JSON):\n%s", json.dumps(parsed, indent=2))
+                log.info("Generated task configuration: %s", parsed['task_name'])
+
+                _cache_task_config(cache_key, parsed)
 
                 return parsed
 
             except Exception as e:
                 if i == 2:
                     raise e
-                print(f"Retry {i + 1}/3: {str(e)}")
+                log.warning("Retry %d/3: %s", i + 1, e)
+                await asyncio.sleep(0.5 * (i + 1))
+
+    async def generate_batch(self, queries: List[str], poll_interval: float = 30.0) -> Dict[str, dict]:
+        """Generate task configurations for many queries through the OpenAI Batch API.
+
+        Batch requests cost half as much as real-time calls but may take up to
+        24 hours, so this is meant for precomputing configurations (nightly runs,
+        eval sweeps). Results are written to the on-disk task cache, so a later
+        generate_research_instructions() call for the same query, in this or any
+        later process, skips the LLM. Queries that a template handles or that are
+        already cached are answered without being sent to the batch.
+
+        Args:
+            queries: User queries to generate configurations for
+            poll_interval: Seconds to wait between batch status checks
+
+        Returns:
+            Mapping of query to task configuration for every query that succeeded
+        """
+        results = {}
+        requests = {}
+        for query in dict.fromkeys(queries):
+            task_config = self._try_template_match(query) or _load_cached_task_config(query, self._prompt_version)
+            if task_config is not None:
+                results[query] = task_config
+                continue
+
+            # One request per remaining query, keyed on the same hash as the response cache
+            prompt = self._build_task_prompt(query)
+            custom_id = _llm_cache_key(_PROMPT_MODEL, prompt)
+            cached = _llm_response_cache.get(custom_id)
+            if cached is not None:
+                results[query] = copy.deepcopy(cached)
+                continue
+            requests[custom_id] = (query, prompt)
+
+        pending_lines = [
+            json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._chat_request(prompt)
+            })
+            for custom_id, (query, prompt) in requests.items()
+        ]
+
+        if not pending_lines:
+            return results
+
+        batch_input = await self.client.files.create(
+            file=("research_tasks.jsonl", "\n".join(pending_lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=batch_input.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        print(f"Submitted batch {batch.id} with {len(pending_lines)} queries")
+
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(poll_interval)
+            batch = await self.client.batches.retrieve(batch.id)
+
+        if batch.status != "completed" or not batch.output_file_id:
+            print(f"Batch {batch.id} finished with status: {batch.status}")
+            return results
+
+        output = await self.client.files.content(batch.output_file_id)
+        generated = 0
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            query, _ = requests.get(record.get("custom_id"), (None, None))
+            response = record.get("response") or {}
+            if query is None or response.get("status_code") != 200:
+                print(f"Batch request {record.get('custom_id')} failed: {record.get('error')}")
+                continue
+            try:
+                parsed = json.loads(response["body"]["choices"][0]["message"]["content"])
+            except (KeyError, IndexError, ValueError) as e:
+                print(f"Could not parse batch result for '{query}': {str(e)}")
+                continue
+            if not _is_valid_task_config(parsed):
+                print(f"Batch result for '{query}' is missing required fields")
+                continue
+            _cache_task_config(record["custom_id"], parsed)
+            _store_task_config(query, self._prompt_version, parsed)
+            results[query] = parsed
+            generated += 1
+
+        print(f"Batch {batch.id} produced {generated}/{len(requests)} task configurations")
+        return results
 
     def _create_dynamic_model(self, fields_config: List[dict], task_name: str) -> Type[BaseModel]:
         """Create a Pydantic model dynamically based on the fields configuration"""
 
+        # Reuse the model class built for an identical task/field signature
+        cache_key = (task_name, tuple(
+            (field['field_name'], field['field_type'], field['description']) for field in fields_config
+        ))
+        cached_model = _MODEL_CACHE.get(cache_key)
+        if cached_model is not None:
+            return cached_model
+
         # Map string types to Python types
         type_mapping = {
             "string": str,
@@ -210,141 +650,228 @@ class PromptGenerator:
             __base__=BaseModel
         )
 
+        _MODEL_CACHE[cache_key] = OutputModel
         return OutputModel
 
     def _generate_agent_instructions(self, task_config: dict) -> str:
         """Generate detailed instructions for the computer-use agent"""
 
-        # Build the data extraction format
-        fields_to_extract = []
-        for field in task_config['data_to_extract']:
-            fields_to_extract.append(f"- {field['field_name']}: {field['description']}")
-
-        # Enhanced instructions with search navigation
-        instructions = f"""
-        You are a specialized research agent performing: {task_config['task_name']}
-
-        IMPORTANT - DUCKDUCKGO SEARCH INSTRUCTIONS:
-        - The DuckDuckGo search box is in the CENTER of the page
-        - It has placeholder text "Search without being tracked"
-        - Click INSIDE the search box (not on the logo or anywhere else)
-        - The search box is a wide rectangular input field
-        - After clicking in the search box, type your search terms
-        - Then press Enter to search
-
-        Your task is to:
-        1. Click in the DuckDuckGo search box that says 'search without being tracked' (the box in the upper center of page)
-        2. Type your search query
-        3. Press Enter to see results
-        4. Click on relevant search results
-        5. Extract the requested information
+        fields = task_config['data_to_extract']
+        search_terms = task_config['search_terms']
 
-        
+        return _AGENT_INSTRUCTIONS_TEMPLATE.format(
+            task_name=task_config['task_name'],
+            search_terms=", ".join(f'"{term}"' for term in search_terms),
+            first_term=search_terms[0],
+            fields="\n".join(f"- {field['field_name']}: {field['description']}" for field in fields),
+            field_format="\n".join(f'      "{field["field_name"]}": <{field["description"]}>,' for field in fields),
+            criteria=task_config['success_criteria']
+        )
 
-        SEARCH TERMS TO USE:
-        {', '.join(f'"{term}"' for term in task_config['search_terms'])}
-
-        NAVIGATION HELPERS:
-        - You should start on duckduckgo.com
-        - Search for: {task_config['search_terms'][0]}
-        - Look for and click on relevant search results
-        - Common search patterns:
-          * Direct product searches: "{task_config['search_terms'][0]}"
-          * Store-specific: "[Store Name] {task_config['search_terms'][0]}"
-          * Shopping searches: "buy {task_config['search_terms'][0]} online"
-        - Click on official store links or shopping results
-        - Once on a relevant site, look for the requested data
-
-        DATA TO EXTRACT:
-        For each item found, extract:
-        {chr(10).join(fields_to_extract)}
-
-        IMPORTANT GUIDELINES:
-        - Take your time to observe what's on screen
-        - Wait 2-3 seconds after page loads before interacting
-        - Move mouse naturally before clicking
-        - Add small delays between actions to appear more human
-        - Start with a duckduckgo search using: {task_config['search_terms'][0]}
-        - Click on promising search results
-        - Work within the single browser page provided
-        - Navigate through pages as needed to find information
-        - Extract data that you can see on screen (don't make up information)
-
-        -If you encounter a CAPTCHA or verification, try returning to search results and clicking a different link
-
-        SUCCESS CRITERIA: {task_config['success_criteria']}
-
-        TIMEOUT PREVENTION: You have a maximum of 20 turns. If you find ANY relevant items before the Maximum , record them in the Response Format.
-        
-        🚨 CRITICAL DATA EXTRACTION RULES - MUST FOLLOW 🚨:
-        1. STOP IMMEDIATELY when you see ANY product with a visible price
-        2. DO NOT continue searching after finding the first relevant item
-        3. Extract data from the FIRST page that shows products/prices
-        4. Product listings, search results, or product pages - ALL are valid for extraction
-        5. If you see a price tag, that's your signal to STOP and EXTRACT
-        6. DO NOT navigate away from a page showing products
-        7. Record what you see RIGHT NOW, not what might be on another page
-        
-        ⏰ TURN LIMITS:
-        - Turn 1-5: Search and navigate to find products
-        - Turn 6+: MUST extract and return data, no more searching
-        - Turn 10+: EMERGENCY MODE - Return whatever you have immediately
 
-        
-        FLEXIBLE DATA EXTRACTION:
-        - If you find partial information, record it anyway
-        - Don't wait for perfect matches to all fields
-        - If a field isn't visible, mark it as "Not found" or "N/A"
-        - Any relevant information is better than no information
-        - A single product with just name and price meets the success criteria
-
-        🛑 EXTRACTION TRIGGERS - STOP AND EXTRACT WHEN YOU SEE:
-        - ANY price (e.g., $19.99, £50, €30)
-        - Product names with prices
-        - "Add to cart" or "Buy now" buttons
-        - Product listings or grids
-        - Search results showing products
-        - ANY combination of product name + price
-        
-        ⚡ IMMEDIATE ACTION REQUIRED:
-        When you see ANY of the above → STOP navigating and extract NOW!
-    
-
-        RESPONSE FORMAT:
-        Return a JSON object with this structure:
-        {{
-            "found_items": [
-                {{
-                    "title": "Name/title of the item",
-                    "position": "Position on page (e.g., '1st result')",
-                    "url": "Current page URL",
-                    "snippet": "Brief description",
-                    {chr(10).join(f'"{field["field_name"]}": <extracted {field["description"]}>,' for field in task_config['data_to_extract'])}
-                }}
-            ],
-            "search_summary": "Summary of what was found",
-            "search_complete": true/false
-        }}
-
-        🚨 FINAL REMINDER: Your PRIMARY directive is to EXTRACT data, not to find the "best" result.
-        The FIRST relevant product you see should be extracted and returned.
-        DO NOT continue searching after finding relevant data.
-        SUCCESS = Fast extraction, not perfect results.
-        """
+async def _encode_base64(data: bytes) -> str:
+    """Base64-encode bytes in a worker thread so the event loop keeps running."""
+    loop = asyncio.get_running_loop()
+    encoded = await loop.run_in_executor(None, base64.b64encode, data)
+    return encoded.decode("ascii")
+
+
+class BrowserPool:
+    """Keep one Playwright driver and WebKit browser warm across research runs.
+
+    Browser cold start dominates setup time, while contexts are cheap. Each
+    PlaywrightComputer gets a fresh context and page from the pool and only
+    closes those on exit; the browser itself stays alive until close().
+    """
+
+    def __init__(self):
+        self.playwright = None
+        self.browser = None
+
+    async def get_playwright(self):
+        """Start the Playwright driver on first use and return it."""
+        if self.playwright is None:
+            self.playwright = await async_playwright().start()
+        return self.playwright
+
+    async def get_browser(self) -> Browser:
+        """Launch the shared WebKit browser on first use and return it."""
+        if self.browser is None or not self.browser.is_connected():
+            playwright = await self.get_playwright()
+            self.browser = await playwright.webkit.launch(
+                headless=False  # Make it visible
+            )
+        return self.browser
+
+    async def acquire(self, viewport: dict, user_agent: str):
+        """Return a fresh (context, page) pair on the shared browser."""
+        browser = await self.get_browser()
+        context = await browser.new_context(viewport=viewport, user_agent=user_agent)
+        page = await context.new_page()
+        return context, page
 
-        return instructions
+    async def close(self) -> None:
+        """Close the shared browser and stop Playwright."""
+        if self.browser:
+            try:
+                await self.browser.close()
+                print("Browser closed")
+            except Exception as e:
+                print(f"Error closing browser: {str(e)}")
+            self.browser = None
+
+        if self.playwright:
+            try:
+                await self.playwright.stop()
+                print("Playwright stopped")
+            except Exception as e:
+                print(f"Error stopping playwright: {str(e)}")
+            self.playwright = None
+
+
+# Shared pool used by every PlaywrightComputer in this process
+_browser_pool = BrowserPool()
+
+
+# Common text that might indicate a human verification or CAPTCHA
+_CAPTCHA_KEYWORDS = ("human", "captcha", "verify", "robot", "bot check")
+
+# Mouse buttons accepted by Playwright
+_VALID_BUTTONS = frozenset(("left", "right", "middle"))
+
+# URLs that look like search results or product pages
+_PRODUCT_URL_RE = re.compile(r"search|product|item")
+
+# Common key names (lowercased) mapped to the names Playwright expects
+_KEY_ALIAS = {
+    "ctrl": "Control",
+    "control": "Control",
+    "cmd": "Meta",
+    "meta": "Meta",
+    "alt": "Alt",
+    "shift": "Shift",
+    "enter": "Enter",
+    "tab": "Tab",
+    "escape": "Escape",
+    "esc": "Escape",
+}
+
+# Names that are already in Playwright format, and the longest alias worth lowercasing
+_KEY_ALIAS_CANONICAL = frozenset(_KEY_ALIAS.values())
+_KEY_ALIAS_MAX_LEN = max(len(name) for name in _KEY_ALIAS)
+
+
+def _fast_alias(key: str, _alias=_KEY_ALIAS.get, _canonical=_KEY_ALIAS_CANONICAL) -> str:
+    """Map a key name to Playwright format, skipping the lowercase copy when it can't match."""
+    # The lookups are bound as defaults so each call resolves them as locals
+    if len(key) > _KEY_ALIAS_MAX_LEN or key in _canonical:
+        return key
+    return _alias(key.lower(), key)
+
+
+def _is_typeable(key) -> bool:
+    """Return True for a single printable character that can be sent via keyboard.type()."""
+    return isinstance(key, str) and len(key) == 1 and key.isprintable()
+
+
+@functools.lru_cache(maxsize=256)
+def _normalize_combo(keys: Tuple[str, ...]) -> str:
+    """Map key names to Playwright format and join them into one combination string."""
+    return "+".join([_fast_alias(key) for key in keys])
+
+
+@functools.lru_cache(maxsize=64)
+def _normalize_key(key: str) -> str:
+    """Map a single key name to Playwright format."""
+    return _fast_alias(key)
+
+
+# Upper bound for a single browser action, so one stuck call (e.g. a hanging
+# page.goto) fails fast instead of using up the whole research budget
+_ACTION_TIMEOUT = 30
+
+
+def _action_timeout(fn):
+    """Fail an async computer action that runs longer than _ACTION_TIMEOUT seconds.
+
+    The failure is a RuntimeError rather than TimeoutError, so it is never mistaken
+    for the overall research timeout in DynamicResearchAgent.search().
+    """
+    @functools.wraps(fn)
+    async def wrapper(self, *args, **kwargs):
+        action_timeout = asyncio.timeout(_ACTION_TIMEOUT)
+        try:
+            async with action_timeout:
+                return await fn(self, *args, **kwargs)
+        except TimeoutError:
+            if action_timeout.expired():
+                raise RuntimeError(f"{fn.__name__} timed out after {_ACTION_TIMEOUT}s") from None
+            raise
+    return wrapper
+
+
+def _logged_action(error_fmt: str):
+    """Log a failed computer action and re-raise.
+
+    Args:
+        error_fmt: Message template, formatted with the action's bound arguments and the error as {e}
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        async def wrapper(self, *args, **kwargs):
+            try:
+                return await fn(self, *args, **kwargs)
+            except Exception as e:
+                try:
+                    bound = signature.bind(self, *args, **kwargs)
+                    bound.apply_defaults()
+                    message = error_fmt.format(e=e, **bound.arguments)
+                except (TypeError, KeyError, IndexError):
+                    # The call itself didn't fit the signature (e.g. the SDK passing a
+                    # path to drag()); don't let formatting hide the original error
+                    message = f"Error in {fn.__name__}: {e}"
+                action_log.error(message)
+                raise
+        return wrapper
+    return decorator
 
 
 # Define a simpler playwright-based computer implementation
 class PlaywrightComputer(AsyncComputer):
     """A simplified Playwright-based computer implementation for the ComputerTool."""
 
-    def __init__(self):
-        """Initialize the PlaywrightComputer."""
+    # Plain attributes rather than properties: both are read before every tool call.
+    # The OpenAI API expects 'windows', 'mac', 'linux', or 'browser' as a string, not
+    # an object; we return 'mac' since we're on a Mac. The class-level values satisfy
+    # AsyncComputer's abstract properties, and __init__ sets the real dimensions.
+    environment = 'mac'
+    dimensions = (1280, 720)
+
+    # Message logged for every type() action
+    _TYPE_FMT = "⌨️  Turn %d: Typed: %s"
+
+    # CAPTCHA keywords matched in a single case-insensitive regex pass
+    # instead of one substring scan per keyword
+    _CAPTCHA_PATTERN = "|".join(re.escape(text) for text in _CAPTCHA_KEYWORDS)
+    _CAPTCHA_SCAN_JS = (
+        "(p) => new RegExp(p, 'i').test(document.body ? document.body.innerText : '')"
+    )
+
+    def __init__(self, pool: Optional[BrowserPool] = None):
+        """Initialize the PlaywrightComputer.
+
+        Args:
+            pool: Browser pool to take contexts from (defaults to the shared pool)
+        """
+        self._pool = pool or _browser_pool
+        self._owns_browser = False
         self._width = 1280
         self._height = 720
         self._device_pixel_ratio = 1.0
         self._user_agent = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+        self.dimensions = (self._width, self._height)
 
         self.playwright = None
         self.browser = None
@@ -353,16 +880,27 @@ class PlaywrightComputer(AsyncComputer):
         
         # Add turn tracking for better debugging
         self.turn_count = 0
-        self.actions_log = []
+        # Bounded so long or reused sessions don't grow it without limit; entries are (turn, action)
+        self.actions_log = deque(maxlen=64)
+        self._warned_extract = False
 
-    @property
-    def environment(self) -> str:
-        """Return the environment as a string.
+        # Screenshot started right after an action, consumed by the next screenshot() call
+        self._pending_screenshot: Optional[asyncio.Task] = None
 
-        The OpenAI API expects 'windows', 'mac', 'linux', or 'browser', not an object.
-        Based on the error message, we're returning 'mac' since we're on a Mac.
-        """
-        return 'mac'  # Return as a string, not an object
+        # CDP session for direct screenshot capture (Chromium only), and the viewport
+        # clip that scales its captures down to CSS pixels
+        self._cdp = None
+        self._cdp_clip: Optional[dict] = None
+
+        # Keyboard and mouse handles of self.page, set once the page exists
+        self._kb = None
+        self._mouse = None
+
+        # Consecutive single-character key presses, sent as one keyboard.type() call
+        self._type_buffer: List[str] = []
+
+        # Scroll waiting to be dispatched: {"x", "y", "dx", "dy"} or None
+        self._pending_scroll: Optional[dict] = None
 
     async def search_and_navigate(self, search_query: str) -> None:
         """Search via Google and help navigate to results - perfect for WebKit browser."""
@@ -382,22 +920,25 @@ class PlaywrightComputer(AsyncComputer):
             if search_box:
                 await search_box.click()
                 # Clear existing text (Cmd+A for Mac, then Delete)
-                await self.page.keyboard.press("Meta+A")  # Select all
-                await self.page.keyboard.press("Delete")
+                await self._kb.press("Meta+A")  # Select all
+                await self._kb.press("Delete")
 
             # Type the search query
             print(f"Searching for: {search_query}")
-            await self.page.keyboard.type(search_query, delay=50)
+            await self._kb.type(search_query, delay=50)
 
             # Press Enter to search
-            await self.page.keyboard.press("Enter")
+            await self._kb.press("Enter")
 
             # Wait for search results
             await self.page.wait_for_selector('div#search', timeout=5000)
             print("Search results loaded")
 
             # Give results time to fully render
-            await asyncio.sleep(2)
+            try:
+                await self.page.wait_for_load_state("networkidle", timeout=2000)
+            except PlaywrightTimeoutError:
+                pass
 
         except Exception as e:
             print(f"Error during search: {str(e)}")
@@ -412,7 +953,7 @@ class PlaywrightComputer(AsyncComputer):
         """Set up Playwright resources based on user's browser preference."""
         try:
             print("Starting Playwright...")
-            self.playwright = await async_playwright().start()
+            self.playwright = await self._pool.get_playwright()
 
             print("\n==== BROWSER SELECTION ====")
             print("Please choose your preferred browser approach:")
@@ -437,6 +978,7 @@ class PlaywrightComputer(AsyncComputer):
                 try:
                     print("Connecting to Chrome with remote debugging...")
                     self.browser = await self.playwright.chromium.connect_over_cdp("http://localhost:9222")
+                    self._owns_browser = True
                     print("Successfully connected to Chrome!")
 
                     # Get all pages
@@ -457,30 +999,35 @@ class PlaywrightComputer(AsyncComputer):
                         # Navigate to a grocery website
                         print("Please navigate to a grocery store website to search for egg prices.")
                         input("Press Enter when you've navigated to a grocery website...")
+
+                    await self._open_cdp_session()
                 except Exception as e:
                     print(f"Error connecting to Chrome: {str(e)}")
                     print("Make sure Chrome is running with remote debugging enabled.")
                     print("Falling back to WebKit browser...")
+                    await self._release_chrome()
                     choice = "2"  # Fall back to WebKit
 
             if choice == "2":
                 # WebKit (Safari-like) browser approach
                 print("\n==== LAUNCHING WEBKIT (SAFARI-LIKE) BROWSER ====")
-                input("Press Enter to launch the browser...")
+                if self._pool.browser is None:
+                    input("Press Enter to launch the browser...")
 
-                # Launch a new WebKit browser (Safari-like)
-                print("Launching WebKit browser...")
-                self.browser = await self.playwright.webkit.launch(
-                    headless=False  # Make it visible
-                )
-                print("Successfully launched WebKit browser!")
+                    # Launch a new WebKit browser (Safari-like)
+                    print("Launching WebKit browser...")
+                    self.browser = await self._pool.get_browser()
+                    print("Successfully launched WebKit browser!")
+                else:
+                    print("Reusing warm WebKit browser...")
+                    self.browser = self._pool.browser
 
-                # Create a new context and page
-                self.context = await self.browser.new_context(
+                # Create a new context and page on the shared browser
+                self.context, self.page = await self._pool.acquire(
                     viewport={"width": self._width, "height": self._height},
                     user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15"
                 )
-                self.page = await self.context.new_page()
+                self.browser = self._pool.browser
 
                 # Start with Google instead of blank page
                 print("Navigating to DuckDuckgo...")
@@ -496,6 +1043,10 @@ class PlaywrightComputer(AsyncComputer):
                 await asyncio.sleep(2)  # Give user time to see Google loaded
 
 
+            # Resolve the input handles once; every action method uses them
+            self._kb = self.page.keyboard
+            self._mouse = self.page.mouse
+
             # Verify we can interact with the page (for both approaches)
             try:
                 print("Testing connection to the page...")
@@ -517,20 +1068,30 @@ class PlaywrightComputer(AsyncComputer):
                 await self.__aexit__(type(e), e, None)
             raise
 
-    async def _is_human_verification_present(self) -> bool:
-        """Check if there's a human verification or CAPTCHA on the page."""
-        try:
-            # Look for common text or elements that might indicate a verification
-            captcha_texts = ["human", "captcha", "verify", "robot", "bot check"]
+    async def _release_chrome(self) -> None:
+        """Disconnect from a Chrome session that failed to set up, before falling back to WebKit."""
+        if self._cdp is not None:
+            try:
+                await self._cdp.detach()
+            except Exception:
+                pass
+            self._cdp = None
 
-            # Get the page content
-            content = await self.page.content()
-            content = content.lower()
+        if self._owns_browser and self.browser is not None:
+            try:
+                await self.browser.close()
+            except Exception as e:
+                print(f"Error disconnecting from Chrome: {str(e)}")
+        self._owns_browser = False
+        self.browser = None
+        self.context = None
+        self.page = None
 
-            # Check if any of the keywords are in the page content
-            for text in captcha_texts:
-                if text in content:
-                    return True
+        """Check if there's a human verification or CAPTCHA on the page."""
+        try:
+            # Scan the visible text in the browser so only a boolean crosses the CDP boundary
+            if await self.page.evaluate(self._CAPTCHA_SCAN_JS, self._CAPTCHA_PATTERN):
+                return True
 
             # Also check for common CAPTCHA elements
             captcha_elements = await self.page.query_selector_all(
@@ -544,9 +1105,22 @@ class PlaywrightComputer(AsyncComputer):
             return False
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Clean up Playwright resources."""
+        """Clean up Playwright resources.
+
+        Only the page and context are closed for pooled browsers; the shared
+        browser and Playwright driver are closed by BrowserPool.close().
+        """
         print("Cleaning up Playwright resources...")
 
+        self._discard_pending_screenshot()
+
+        if self._cdp:
+            try:
+                await self._cdp.detach()
+            except Exception as e:
+                print(f"Error detaching CDP session: {str(e)}")
+            self._cdp = None
+
         if self.page:
             try:
                 await self.page.close()
@@ -554,6 +1128,8 @@ class PlaywrightComputer(AsyncComputer):
             except Exception as e:
                 print(f"Error closing page: {str(e)}")
             self.page = None
+            self._kb = None
+            self._mouse = None
 
         if self.context:
             try:
@@ -563,59 +1139,133 @@ class PlaywrightComputer(AsyncComputer):
                 print(f"Error closing context: {str(e)}")
             self.context = None
 
-        if self.browser:
+        if self.browser and self._owns_browser:
             try:
                 await self.browser.close()
                 print("Browser closed")
             except Exception as e:
                 print(f"Error closing browser: {str(e)}")
-            self.browser = None
+        self.browser = None
+        self._owns_browser = False
 
-        if self.playwright:
-            try:
-                await self.playwright.stop()
-                print("Playwright stopped")
-            except Exception as e:
-                print(f"Error stopping playwright: {str(e)}")
-            self.playwright = None
+        # The Playwright driver belongs to the pool
+        self.playwright = None
 
+    @_logged_action("Error taking screenshot: {e}")
+    @_action_timeout
     async def screenshot(self) -> str:
         """Take a screenshot of the current state."""
         self.turn_count += 1
-        print(f"\n📸 Turn {self.turn_count}: Taking screenshot")
+        log.debug("Turn %d: Taking screenshot", self.turn_count)
         
         if not self.page:
             raise RuntimeError("Playwright page not initialized")
 
+        await self._flush_input()
+
+        pending, self._pending_screenshot = self._pending_screenshot, None
         try:
-            # Use only basic parameters that are universally supported
-            screenshot_bytes = await self.page.screenshot(
-                type="jpeg",  # Try JPEG instead of PNG (faster)
-                quality=70  # Medium quality for speed
+            if pending is not None:
+                try:
+                    base64_image = await pending
+                except PlaywrightError:
+                    # The prefetch failed (e.g. mid-navigation); take a fresh one instead
+                    base64_image = await self._capture_screenshot()
+            else:
+                base64_image = await self._capture_screenshot()
+        except PlaywrightError as e:
+            # Try an even simpler fallback, keeping only the format and CSS-pixel scale so
+            # the image still matches the reported dimensions
+            log.warning("Error taking screenshot (%s), attempting basic fallback", e)
+            try:
+                screenshot_bytes = await self.page.screenshot(type="jpeg", scale="css")
+            except PlaywrightError as fallback_error:
+                raise RuntimeError(
+                    f"Failed to capture screenshot: {str(e)} (fallback also failed: {str(fallback_error)})"
+                ) from fallback_error
+            base64_image = await _encode_base64(screenshot_bytes)
+
+        log.debug("Screenshot captured (length: %d chars)", len(base64_image))
+        return base64_image
+
+    async def _capture_screenshot(self) -> str:
+        """Capture the viewport and return it base64-encoded."""
+        if self._cdp:
+            # CDP already returns base64, so there is nothing left to encode
+            result = await self._cdp.send(
+                "Page.captureScreenshot",
+                {"format": "jpeg", "quality": 60, "captureBeyondViewport": False, "clip": self._cdp_clip},
             )
+            return result["data"]
 
-            # Encode to base64
-            base64_image = base64.b64encode(screenshot_bytes).decode("utf-8")
+        # Use only basic parameters that are universally supported
+        screenshot_bytes = await self.page.screenshot(
+            type="jpeg",  # Try JPEG instead of PNG (faster)
+            quality=60,  # Smaller upload to the vision model, still legible
+            scale="css"  # One pixel per CSS pixel, even on high-DPI displays
+        )
 
-            print(f"Screenshot captured successfully (length: {len(base64_image)} chars)")
+        # Encode to base64 off the event loop
+        return await _encode_base64(screenshot_bytes)
 
-            return base64_image
+    async def _open_cdp_session(self) -> None:
+        """Attach a CDP session to the page so screenshots skip Playwright's wrapper."""
+        try:
+            # CDP captures in device pixels; clipping at 1/devicePixelRatio keeps them at one
+            # pixel per CSS pixel, like page.screenshot(scale="css"), so click coordinates match
+            self._cdp_clip = await self.page.evaluate(
+                "() => ({x: 0, y: 0, width: innerWidth, height: innerHeight, scale: 1 / devicePixelRatio})"
+            )
+            self._cdp = await self.context.new_cdp_session(self.page)
         except Exception as e:
-            print(f"Error taking screenshot: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            print(f"CDP session unavailable, using page.screenshot(): {str(e)}")
+            self._cdp = None
+
+    def _prefetch_screenshot(self) -> None:
+        """Start capturing the next screenshot in the background after an action."""
+        self._discard_pending_screenshot()
+        self._pending_screenshot = asyncio.create_task(self._capture_screenshot())
+
+    def _discard_pending_screenshot(self) -> None:
+        """Cancel a prefetched screenshot, which is stale once another action runs."""
+        pending, self._pending_screenshot = self._pending_screenshot, None
+        if pending is None:
+            return
+        if not pending.done():
+            pending.cancel()
+        elif not pending.cancelled():
+            # cancel() is a no-op on a finished task; retrieve a failed prefetch's error
+            # so asyncio doesn't report "Task exception was never retrieved"
+            pending.exception()
+
+    async def _flush_type(self) -> None:
+        """Type any buffered single-character key presses in one call."""
+        if self._type_buffer:
+            text = "".join(self._type_buffer)
+            self._type_buffer.clear()
+            await self._kb.type(text)
+            action_log.info("Typed buffered keys: %s", text)
+
+    async def _click_and_settle(self, click) -> None:
+        """Run a click and, only if it started a navigation, wait for the new page to load.
 
-            # Try an even simpler fallback
-            try:
-                print("Attempting basic fallback screenshot...")
-                screenshot_bytes = await self.page.screenshot()  # No parameters at all
-                base64_image = base64.b64encode(screenshot_bytes).decode("utf-8")
-                print(f"Fallback screenshot successful (length: {len(base64_image)} chars)")
-                return base64_image
-            except Exception as fallback_error:
-                print(f"Fallback screenshot also failed: {str(fallback_error)}")
-                raise RuntimeError(f"Failed to capture screenshot: {str(e)}")
+        Args:
+            click: The mouse click coroutine to run
+        """
+        try:
+            async with self.page.expect_event("framenavigated", timeout=300):
+                await click
+        except PlaywrightTimeoutError:
+            # No navigation, so the page is already up to date
+            return
 
+        try:
+            await self.page.wait_for_load_state("domcontentloaded", timeout=2000)
+        except PlaywrightTimeoutError:
+            pass
+
+    @_logged_action("Error performing click at ({x}, {y}) with {button} button: {e}")
+    @_action_timeout
     async def click(self, x: int, y: int, button: str = "left") -> None:
         """Click at the specified coordinates with the specified button.
 
@@ -628,30 +1278,28 @@ class PlaywrightComputer(AsyncComputer):
             raise RuntimeError("Playwright page not initialized")
 
         # Validate button parameter
-        valid_buttons = ["left", "right", "middle"]
-        if button not in valid_buttons:
-            print(f"Warning: Invalid button '{button}' requested, defaulting to 'left'")
+        if button not in _VALID_BUTTONS:
+            log.warning("Invalid button '%s' requested, defaulting to 'left'", button)
             button = "left"
 
-        try:
-            await self.page.mouse.click(x, y, button=button)
-            action = f"Clicked at ({x}, {y}) with {button} button"
-            print(f"🖱️  Turn {self.turn_count}: {action}")
-            self.actions_log.append({"turn": self.turn_count, "action": action})
-            
-            # Check current page content for products/prices
-            current_url = self.page.url
-            if "search" in current_url or "product" in current_url or "item" in current_url:
-                print(f"📍 Turn {self.turn_count}: On potential product page - {current_url}")
-                if self.turn_count >= 8:
-                    print(f"🚨 Turn {self.turn_count}: CRITICAL - Should extract NOW from {current_url}")
-            
-            # Add a small delay after clicking to allow page to respond
-            await asyncio.sleep(0.5)
-        except Exception as e:
-            print(f"Error performing click at ({x}, {y}) with {button} button: {str(e)}")
-            raise
+        await self._flush_input()
 
+        await self._click_and_settle(self._mouse.click(x, y, button=button))
+        action = f"Clicked at ({x}, {y}) with {button} button"
+        action_log.info("Turn %d: %s", self.turn_count, action)
+        self.actions_log.append((self.turn_count, action))
+
+        # Check current page content for products/prices
+        current_url = self.page.url
+        if _PRODUCT_URL_RE.search(current_url):
+            log.debug("Turn %d: On potential product page - %s", self.turn_count, current_url)
+            if self.turn_count >= 8:
+                log.warning("Turn %d: Should extract NOW from %s", self.turn_count, current_url)
+
+        self._prefetch_screenshot()
+
+    @_logged_action("Error performing double-click at ({x}, {y}) with {button} button: {e}")
+    @_action_timeout
     async def double_click(self, x: int, y: int, button: str = "left") -> None:
         """Double click at the specified coordinates with the specified button.
 
@@ -664,91 +1312,89 @@ class PlaywrightComputer(AsyncComputer):
             raise RuntimeError("Playwright page not initialized")
 
         # Validate button parameter
-        valid_buttons = ["left", "right", "middle"]
-        if button not in valid_buttons:
-            print(f"Warning: Invalid button '{button}' requested, defaulting to 'left'")
+        if button not in _VALID_BUTTONS:
+            log.warning("Invalid button '%s' requested, defaulting to 'left'", button)
             button = "left"
 
-        try:
-            await self.page.mouse.dblclick(x, y, button=button)
-            print(f"Double-clicked at coordinates: ({x}, {y}) with {button} button")
-            # Add a small delay after double-clicking
-            await asyncio.sleep(0.5)
-        except Exception as e:
-            print(f"Error performing double-click at ({x}, {y}) with {button} button: {str(e)}")
-            raise
+        await self._flush_input()
+
+        await self._click_and_settle(self._mouse.dblclick(x, y, button=button))
+        action_log.info("Double-clicked at coordinates: (%s, %s) with %s button", x, y, button)
+        self._prefetch_screenshot()
 
+    @_logged_action("Error pressing keys {keys}: {e}")
+    @_action_timeout
     async def keypress(self, keys: Union[str, List[str]]) -> None:
         """Press one or more keys."""
         if not self.page:
             raise RuntimeError("Playwright page not initialized")
 
-        try:
-            # Handle both string and list input
-            if isinstance(keys, list):
-                # Map common key names to Playwright format
-                mapped_keys = []
-                for key in keys:
-                    if key.upper() == "CTRL":
-                        mapped_keys.append("Control")
-                    elif key.upper() == "CMD":
-                        mapped_keys.append("Meta")
-                    elif key.upper() == "ALT":
-                        mapped_keys.append("Alt")
-                    elif key.upper() == "SHIFT":
-                        mapped_keys.append("Shift")
-                    elif key.upper() == "ENTER":
-                        mapped_keys.append("Enter")
-                    elif key.upper() == "TAB":
-                        mapped_keys.append("Tab")
-                    elif key.upper() == "ESCAPE":
-                        mapped_keys.append("Escape")
-                    else:
-                        mapped_keys.append(key)
-
-                if len(mapped_keys) == 1:
-                    # Single key from list
-                    await self.page.keyboard.press(mapped_keys[0])
-                    print(f"Pressed key: {mapped_keys[0]}")
-                else:
-                    # Key combination
-                    key_combination = "+".join(mapped_keys)
-                    await self.page.keyboard.press(key_combination)
-                    print(f"Pressed key combination: {key_combination}")
+        self._discard_pending_screenshot()
+
+        # Buffer plain characters so a run of them becomes a single keyboard.type()
+        single_key = keys[0] if isinstance(keys, list) and len(keys) == 1 else keys
+        if _is_typeable(single_key):
+            await self._flush_scroll()
+            self._type_buffer.append(single_key)
+            return
+        await self._flush_input()
+
+        # Handle both string and list input
+        if isinstance(keys, list):
+            # Map common key names to Playwright format (memoized per combination)
+            key_combination = _normalize_combo(tuple(keys))
+            await self._kb.press(key_combination)
+
+            if len(keys) == 1:
+                # Single key from list
+                action_log.info("Pressed key: %s", key_combination)
             else:
-                # Fix common case issues for single keys
-                if keys.upper() == "ENTER":
-                    keys = "Enter"
-                elif keys.upper() == "TAB":
-                    keys = "Tab"
-                elif keys.upper() == "ESCAPE":
-                    keys = "Escape"
-                elif keys.upper() == "CTRL":
-                    keys = "Control"
-                elif keys.upper() == "CMD":
-                    keys = "Meta"
-
-                await self.page.keyboard.press(keys)
-                print(f"Pressed key: {keys}")
-        except Exception as e:
-            print(f"Error pressing keys {keys}: {str(e)}")
-            raise  # Make sure this says 'raise' not 'raiseexit'
+                action_log.info("Pressed key combination: %s", key_combination)
+        else:
+            # Fix common case issues for single keys
+            key = _normalize_key(keys)
+
+            await self._kb.press(key)
+            action_log.info("Pressed key: %s", key)
 
+    @_logged_action("Error dragging from ({from_x}, {from_y}) to ({to_x}, {to_y}): {e}")
+    @_action_timeout
     async def drag(self, from_x: int, from_y: int, to_x: int, to_y: int) -> None:
         """Drag from one set of coordinates to another."""
         if not self.page:
             raise RuntimeError("Playwright page not initialized")
 
-        try:
-            await self.page.mouse.move(from_x, from_y)
-            await self.page.mouse.down()
-            await self.page.mouse.move(to_x, to_y)
-            await self.page.mouse.up()
-            print(f"Dragged from ({from_x}, {from_y}) to ({to_x}, {to_y})")
-        except Exception as e:
-            print(f"Error dragging from ({from_x}, {from_y}) to ({to_x}, {to_y}): {str(e)}")
-            raise
-
+        self._discard_pending_screenshot()
+        await self._flush_input()
+
+        if self._cdp:
+            # Send the raw input events straight over CDP, skipping Playwright's
+            # per-call wrapper and actionability waits
+            # (event type, x, y, button, pressed-buttons bitmask)
+            events = (
+                ("mouseMoved", from_x, from_y, "none", 0),
+                ("mousePressed", from_x, from_y, "left", 1),
+                ("mouseMoved", to_x, to_y, "left", 1),
+                ("mouseReleased", to_x, to_y, "left", 0),
+            )
+            for event_type, x, y, button, buttons in events:
+                await self._cdp.send("Input.dispatchMouseEvent", {
+                    "type": event_type,
+                    "x": x,
+                    "y": y,
+                    "button": button,
+                    "buttons": buttons,
+                    "clickCount": 1 if event_type != "mouseMoved" else 0
+                })
+        else:
+            await self._mouse.move(from_x, from_y)
+            await self._mouse.down()
+            await self._mouse.move(to_x, to_y)
+            await self._mouse.up()
+        action_log.info("Dragged from (%s, %s) to (%s, %s)", from_x, from_y, to_x, to_y)
+
+    @_logged_action("Error typing text: {e}")
+    @_action_timeout
     async def type(self, text: str, delay: int = 0) -> None:
         """Type the specified text with an optional delay between keystrokes.
 
@@ -759,62 +1405,73 @@ class PlaywrightComputer(AsyncComputer):
         if not self.page:
             raise RuntimeError("Playwright page not initialized")
 
-        try:
-            if delay > 0:
-                await self.page.keyboard.type(text, delay=delay)
-            else:
-                await self.page.keyboard.type(text)
-            action = f"Typed: {text}"
-            print(f"⌨️  Turn {self.turn_count}: {action}")
-            self.actions_log.append({"turn": self.turn_count, "action": action})
-            
-            # Check if we're past turn 6 and should be extracting
-            if self.turn_count >= 6:
-                print(f"⚠️  Turn {self.turn_count}: Agent should be extracting data by now!")
-        except Exception as e:
-            print(f"Error typing text: {str(e)}")
-            raise
+        self._discard_pending_screenshot()
+        await self._flush_input()
 
+        if delay > 0:
+            await self._kb.type(text, delay=delay)
+        else:
+            await self._kb.type(text)
+        action_log.info(self._TYPE_FMT, self.turn_count, text)
+        self.actions_log.append((self.turn_count, "Typed: " + text))
+
+        # Warn once if we're past turn 6 and should be extracting
+        if self.turn_count >= 6 and not self._warned_extract:
+            self._warned_extract = True
+            log.warning("Turn %d: Agent should be extracting data by now!", self.turn_count)
+
+    @_logged_action("Error pressing key {key}: {e}")
+    @_action_timeout
     async def press(self, key: str) -> None:
         """Press a specific key."""
         if not self.page:
             raise RuntimeError("Playwright page not initialized")
 
-        try:
-            await self.page.keyboard.press(key)
-            print(f"Pressed key: {key}")
-        except Exception as e:
-            print(f"Error pressing key {key}: {str(e)}")
-            raise
+        self._discard_pending_screenshot()
 
+        # Buffer plain characters so a run of them becomes a single keyboard.type()
+        if _is_typeable(key):
+            await self._flush_scroll()
+            self._type_buffer.append(key)
+            return
+        await self._flush_input()
 
+        await self._kb.press(key)
+        action_log.info("Pressed key: %s", key)
 
+    @_logged_action("Error navigating to {url}: {e}")
+    @_action_timeout
     async def navigate(self, url: str) -> None:
         """Navigate to a URL."""
         if not self.page:
             raise RuntimeError("Playwright page not initialized")
 
+        self._discard_pending_screenshot()
+        await self._flush_input()
+
+        await self.page.goto(url, wait_until="domcontentloaded")
+        action_log.info("Navigated to: %s", url)
+        # Wait for page to stabilize after navigation, up to the old 2 s budget
         try:
-            await self.page.goto(url, wait_until="domcontentloaded")
-            print(f"Navigated to: {url}")
-            # Wait for page to stabilize after navigation
-            await asyncio.sleep(2)
-        except Exception as e:
-            print(f"Error navigating to {url}: {str(e)}")
-            raise
+            await self.page.wait_for_load_state("networkidle", timeout=2000)
+        except PlaywrightTimeoutError:
+            pass
 
+    @_logged_action("Error moving mouse to ({x}, {y}): {e}")
+    @_action_timeout
     async def move(self, x: int, y: int) -> None:
         """Move the mouse to the specified coordinates."""
         if not self.page:
             raise RuntimeError("Playwright page not initialized")
 
-        try:
-            await self.page.mouse.move(x, y)
-            print(f"Moved mouse to: ({x}, {y})")
-        except Exception as e:
-            print(f"Error moving mouse to ({x}, {y}): {str(e)}")
-            raise
+        self._discard_pending_screenshot()
+        await self._flush_input()
 
+        await self._mouse.move(x, y)
+        action_log.info("Moved mouse to: (%s, %s)", x, y)
+
+    @_logged_action("Error scrolling: {e}")
+    @_action_timeout
     async def scroll(self, x: int, y: int, scroll_x: int = 0, scroll_y: int = 0) -> None:
         """Scroll by the specified amount.
 
@@ -827,50 +1484,63 @@ class PlaywrightComputer(AsyncComputer):
         if not self.page:
             raise RuntimeError("Playwright page not initialized")
 
-        try:
-            # First move to the specified position
-            if x > 0 and y > 0:
-                await self.page.mouse.move(x, y)
+        self._discard_pending_screenshot()
+        await self._flush_type()
 
-            # Then scroll using the wheel event
-            await self.page.mouse.wheel(scroll_x, scroll_y)
-            print(f"Scrolled at position ({x}, {y}) by ({scroll_x}, {scroll_y})")
+        # Accumulate scrolls at the same cursor position; they are dispatched as one
+        # wheel event when the cursor moves or any other action runs
+        pending = self._pending_scroll
+        if pending is not None and pending["x"] == x and pending["y"] == y:
+            pending["dx"] += scroll_x
+            pending["dy"] += scroll_y
+            return
 
-            # Add a small delay after scrolling to allow page to update
-            await asyncio.sleep(0.5)
-        except Exception as e:
-            print(f"Error scrolling at ({x}, {y}) by ({scroll_x}, {scroll_y}): {str(e)}")
-            raise
+        await self._flush_scroll()
+        self._pending_scroll = {"x": x, "y": y, "dx": scroll_x, "dy": scroll_y}
 
-    async def wait(self, ms: int = 1000) -> None:
-        """Wait for the specified number of milliseconds.
+    async def _flush_scroll(self) -> None:
+        """Dispatch the accumulated scroll, if any, as a single wheel event."""
+        pending, self._pending_scroll = self._pending_scroll, None
+        if pending is None or (pending["dx"] == 0 and pending["dy"] == 0):
+            return
 
-        Args:
-            ms: The number of milliseconds to wait (default: 1000ms = 1 second)
-        """
-        try:
-            await asyncio.sleep(ms / 1000.0)
-            print(f"Waited for {ms} milliseconds")
-        except Exception as e:
-            print(f"Error waiting for {ms} ms: {str(e)}")
-            raise
+        # Errors propagate to the action that flushed the scroll, whose
+        # _logged_action wrapper reports them
+        x, y, scroll_x, scroll_y = pending["x"], pending["y"], pending["dx"], pending["dy"]
 
+        # First move to the specified position
+        if x > 0 and y > 0:
+            await self._mouse.move(x, y)
 
+        # Then scroll using the wheel event
+        await self._mouse.wheel(scroll_x, scroll_y)
+        action_log.info("Scrolled at position (%s, %s) by (%s, %s)", x, y, scroll_x, scroll_y)
 
+        # Add a small delay once per burst to allow page to update
+        await asyncio.sleep(0.05)
 
+    async def _flush_input(self) -> None:
+        """Dispatch any buffered scroll or typing before the next action."""
+        await self._flush_scroll()
+        await self._flush_type()
 
-    @property
-    def dimensions(self) -> tuple:
-        """Return the dimensions of the browser window as a tuple."""
-        return (self._width, self._height)
+    @_logged_action("Error waiting for {ms} ms: {e}")
+    async def wait(self, ms: int = 1000) -> None:
+        """Wait for the specified number of milliseconds.
 
+        Args:
+            ms: The number of milliseconds to wait (default: 1000ms = 1 second)
+        """
+        self._discard_pending_screenshot()
+        if self.page:
+            await self._flush_input()
+
+        await asyncio.sleep(ms / 1000.0)
+        action_log.info("Waited for %s milliseconds", ms)
 
-# After the PlaywrightComputer class ends (after the dimensions property)
 
 async def debug_screenshot(computer):
     """Debug function to test screenshot capture and formatting."""
-    import base64  # Make sure this import is added if needed
-
     try:
         # Take a screenshot
         screenshot_data = await computer.screenshot()
@@ -891,9 +1561,13 @@ async def debug_screenshot(computer):
             parts = screenshot_data.split(",", 1)
             if len(parts) == 2:
                 header, content = parts
-                # Try decoding the base64 content
-                decoded = base64.b64decode(content)
-                print(f"✓ Base64 content is valid (decoded length: {len(decoded)} bytes)")
+                # Validate only the leading chunk (where format errors show up) and compute
+                # the decoded size arithmetically instead of decoding the whole image
+                prefix = content[:64]
+                base64.b64decode(prefix + "=" * (-len(prefix) % 4), validate=True)
+                padding = content.endswith("==") + content.endswith("=")
+                decoded_len = (len(content) * 3) // 4 - padding
+                print(f"✓ Base64 content is valid (decoded length: {decoded_len} bytes)")
             else:
                 print("✗ Screenshot data does not have proper data URL structure with comma separator")
         except Exception as e:
@@ -912,21 +1586,17 @@ async def debug_screenshot(computer):
 class SimpleComputer(AsyncComputer):
     """A simple computer implementation for the ComputerTool (for testing)."""
 
+    # Same plain attributes as PlaywrightComputer
+    environment = 'mac'
+    dimensions = (1280, 720)
+
     def __init__(self):
         """Initialize the SimpleComputer."""
         self._width = 1280
         self._height = 720
         self._device_pixel_ratio = 1.0
         self._user_agent = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-
-    @property
-    def environment(self) -> str:
-        """Return the environment as a string.
-
-        The OpenAI API expects 'windows', 'mac', 'linux', or 'browser', not an object.
-        Based on the error message, we're returning 'mac' since we're on a Mac.
-        """
-        return 'mac'  # Return as a string, not an object
+        self.dimensions = (self._width, self._height)
 
     async def screenshot(self) -> str:
         """Take a screenshot of the current state."""
@@ -973,21 +1643,44 @@ class SimpleComputer(AsyncComputer):
         """Wait for the specified number of milliseconds."""
         print(f"Waited for {ms} milliseconds (simulated)")
 
-    @property
-    def dimensions(self) -> tuple:
-        """Return the dimensions of the browser window as a tuple."""
-        return (self._width, self._height)
+
+# Reused to pull the JSON object out of the agent's free-form final output
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _extract_json_object(text: str, start: int) -> Tuple[Any, int]:
+    """Parse the JSON object starting at text[start], returning (data, end index)."""
+    if orjson is not None:
+        # Fast path: the object usually runs to the last closing brace
+        end = text.rfind("}") + 1
+        if end > start:
+            try:
+                return orjson.loads(text[start:end]), end
+            except orjson.JSONDecodeError:
+                pass  # Trailing text with braces; let the stdlib decoder find the real end
+
+    return _JSON_DECODER.raw_decode(text, start)
 
 
 class DynamicResearchAgent:
     """General-purpose research agent with dynamic instructions"""
 
-    def __init__(self, api_key: Optional[str] = None, computer: Optional[AsyncComputer] = None):
-        """Initialize the Dynamic Research Agent"""
+    __slots__ = ("computer", "strict", "prompt_generator", "current_task", "output_model", "agent")
+
+    def __init__(self, api_key: Optional[str] = None, computer: Optional[AsyncComputer] = None,
+                 strict: bool = False):
+        """Initialize the Dynamic Research Agent
+
+        Args:
+            api_key: Optional OpenAI API key (overrides the environment variable)
+            computer: Computer implementation for the agent (defaults to SimpleComputer)
+            strict: Fail the whole result on any validation error instead of keeping valid items
+        """
         if api_key:
             os.environ["OPENAI_API_KEY"] = api_key
 
         self.computer = computer
+        self.strict = strict
         self.prompt_generator = PromptGenerator()
         self.current_task = None
         self.output_model = None
@@ -1035,6 +1728,7 @@ class DynamicResearchAgent:
         if not self.agent:
             raise RuntimeError("Must call setup_task() before search()")
 
+        run_timeout = asyncio.timeout(600)  # 10 minutes
         try:
             print(f"\n🚀 Starting {self.current_task}...")
             print("Agent is working (this may take a few minutes)...")
@@ -1050,10 +1744,8 @@ class DynamicResearchAgent:
                 "Your success is measured by extraction speed, not finding the 'perfect' result."
             )
             
-            result = await asyncio.wait_for(
-                Runner.run(self.agent, extraction_prompt, max_turns=20),
-                timeout=600  # 10 minutes
-            )
+            async with run_timeout:
+                result = await Runner.run(self.agent, extraction_prompt, max_turns=20)
 
             end_time = time.time()
             print(f"\n✅ Research completed in {end_time - start_time:.2f} seconds")
@@ -1062,8 +1754,10 @@ class DynamicResearchAgent:
             if hasattr(self.computer, 'actions_log') and self.computer.actions_log:
                 print(f"\n📊 Action Summary - Total turns: {self.computer.turn_count}")
                 print("=" * 60)
-                for action in self.computer.actions_log[-10:]:  # Show last 10 actions
-                    print(f"Turn {action['turn']}: {action['action']}")
+                actions_log = self.computer.actions_log
+                # Show last 10 actions
+                for turn, action in itertools.islice(actions_log, max(len(actions_log) - 10, 0), None):
+                    print(f"Turn {turn}: {action}")
                 print("=" * 60)
 
             # Parse the result
@@ -1080,19 +1774,14 @@ class DynamicResearchAgent:
 
             # Extract JSON
             json_start = output_text.find("{")
-            json_end = output_text.rfind("}")
 
-            if json_start >= 0 and json_end > json_start:
-                json_str = output_text[json_start:json_end + 1]
-                print(f"\n🔍 DEBUG - Found JSON, length: {len(json_str)}")
-                try:
-                    data = json.loads(json_str)
-                    print(f"Parsed data has keys: {list(data.keys())}")
-                    print(f"Number of found_items: {len(data.get('found_items', []))}")
-                except Exception as e:
-                    print(f"JSON parse error: {e}")
-                data = json.loads(json_str)
-                return self.output_model(**data)
+            if json_start >= 0:
+                # Parse the first JSON object, stopping where it closes
+                data, json_end = _extract_json_object(output_text, json_start)
+                print(f"\n🔍 DEBUG - Found JSON, length: {json_end - json_start}")
+                print(f"Parsed data has keys: {list(data.keys())}")
+                print(f"Number of found_items: {len(data.get('found_items', []))}")
+                return self._build_output(data)
             else:
                 # Return empty result if no JSON found
                 return self.output_model(
@@ -1100,18 +1789,46 @@ class DynamicResearchAgent:
                     search_complete=True
                 )
 
-        except asyncio.TimeoutError:
-            return self.output_model(
-                search_summary="Research timed out after 10 minutes",
-                search_complete=False
-            )
         except Exception as e:
+            if isinstance(e, TimeoutError) and run_timeout.expired():
+                return self.output_model(
+                    search_summary="Research timed out after 10 minutes",
+                    search_complete=False
+                )
             print(f"Error during research: {str(e)}")
             return self.output_model(
                 search_summary=f"Error during research: {str(e)}",
                 search_complete=False
             )
 
+    def _build_output(self, data: dict) -> BaseModel:
+        """Validate the agent's JSON into the output model.
+
+        Outside strict mode, output that fails validation is not thrown away: the
+        items that do validate are kept, without revalidating the whole payload.
+        """
+        try:
+            return self.output_model.model_validate(data)
+        except ValidationError as e:
+            if self.strict:
+                raise
+            print(f"Agent output failed validation ({e.error_count()} errors), keeping valid items")
+
+        item_model = get_args(self.output_model.model_fields['found_items'].annotation)[0]
+        found_items = []
+        for item in data.get('found_items') or []:
+            try:
+                found_items.append(item_model.model_validate(item))
+            except ValidationError:
+                continue
+
+        return self.output_model.model_construct(
+            found_items=found_items,
+            search_summary=str(data.get('search_summary', "")),
+            search_complete=bool(data.get('search_complete', False)),
+            timestamp=datetime.now().isoformat()
+        )
+
 
 async def save_search_results(output: BaseModel, filename: Optional[str] = None) -> str:
     """Save search results to a JSON file.
@@ -1134,9 +1851,13 @@ async def save_search_results(output: BaseModel, filename: Optional[str] = None)
 
         # Save the results
         print(f"Saving results to {filepath}...")
-        with open(filepath, "w") as f:
-            # Use model_dump() for any Pydantic model
-            json.dump(output.model_dump(), f, indent=2)
+        # Use model_dump() for any Pydantic model
+        if orjson is not None:
+            with open(filepath, "wb") as f:
+                f.write(orjson.dumps(output.model_dump(), option=orjson.OPT_INDENT_2))
+        else:
+            with open(filepath, "w") as f:
+                json.dump(output.model_dump(), f, indent=2)
 
         print(f"Results saved successfully")
         return filepath
@@ -1145,7 +1866,8 @@ async def save_search_results(output: BaseModel, filename: Optional[str] = None)
         return f"Error saving to {filename}: {str(e)}"
 
 
-async def main_async(user_query: str, save_to_file: bool = True, use_playwright: bool = True):
+async def main_async(user_query: str, save_to_file: bool = True, use_playwright: bool = True,
+                     strict: bool = False):
     """Dynamic research based on user query"""
 
     print("=" * 60)
@@ -1156,7 +1878,7 @@ async def main_async(user_query: str, save_to_file: bool = True, use_playwright:
     if use_playwright:
         try:
             async with PlaywrightComputer() as computer:
-                agent = DynamicResearchAgent(computer=computer)
+                agent = DynamicResearchAgent(computer=computer, strict=strict)
 
                 # Setup the task
                 task_config = await agent.setup_task(user_query)
@@ -1202,11 +1924,22 @@ async def main_async(user_query: str, save_to_file: bool = True, use_playwright:
             print("Falling back to simple computer...")
 
     # Fallback to simple computer
-    agent = DynamicResearchAgent()
+    agent = DynamicResearchAgent(strict=strict)
     await agent.setup_task(user_query)
     return await agent.search()
 
 
+async def _main_with_pool(user_query: str, **kwargs):
+    """Run main_async, then close the shared browser pool and HTTP client once at shutdown"""
+    try:
+        return await main_async(user_query, **kwargs)
+    finally:
+        try:
+            await _browser_pool.close()
+        finally:
+            await _close_http_client()
+
+
 def main():
     """Main entry point with natural language input"""
     parser = argparse.ArgumentParser(description="Dynamic Web Research Tool")
@@ -1225,6 +1958,11 @@ def main():
         action="store_true",
         help="Use simple computer implementation (no browser automation)"
     )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Discard the whole result if the agent output fails validation"
+    )
     parser.add_argument(
         "--api-key",
         help="OpenAI API key (will override environment variable)"
@@ -1232,6 +1970,69 @@ def main():
 
     args = parser.parse_args()
 
+    log_listener = _start_log_listener(os.environ.get("AGENT_LOG_LEVEL"))
+    try:
+        _run_cli(args)
+    finally:
+        # Writes out any records still queued
+        log_listener.stop()
+
+
+class _BatchedStreamHandler(logging.StreamHandler):
+    """StreamHandler whose writes are flushed by _BatchingQueueListener, not per record."""
+
+    def flush(self) -> None:
+        pass
+
+    def flush_batch(self) -> None:
+        super().flush()
+
+
+class _BatchingQueueListener(logging.handlers.QueueListener):
+    """QueueListener that flushes its handlers once each time the queue drains."""
+
+    def dequeue(self, block: bool):
+        if block and self.queue.empty():
+            self._flush_handlers()
+        return super().dequeue(block)
+
+    def stop(self) -> None:
+        super().stop()
+        self._flush_handlers()
+
+    def _flush_handlers(self) -> None:
+        for handler in self.handlers:
+            handler.flush_batch()
+
+
+def _start_log_listener(level: Optional[str]) -> logging.handlers.QueueListener:
+    """Route log records through a queue to a listener thread that writes them in batches.
+
+    The calling thread only merges each record's arguments into its message and
+    enqueues it; the listener thread adds the level and logger name, writes to
+    stderr, and flushes once per burst of records instead of once per record.
+
+    Args:
+        level: AGENT_LOG_LEVEL, applied to every logger; when unset, warnings and
+            errors are shown plus the one-line-per-action messages
+    """
+    log_queue = queue.SimpleQueue()
+    handler = _BatchedStreamHandler()
+    handler.setFormatter(logging.Formatter("%(levelname)s %(name)s: %(message)s"))
+    # QueueHandler merges the arguments into the message before enqueueing; the
+    # listener's handler adds the level and logger name
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    logging.basicConfig(level=(level or "WARNING").upper(), handlers=[queue_handler])
+    if level is None:
+        action_log.setLevel(logging.INFO)
+    listener = _BatchingQueueListener(log_queue, handler)
+    listener.start()
+    return listener
+
+
+def _run_cli(args: argparse.Namespace) -> None:
+    """Run the research flow for the parsed command-line arguments."""
     # Set API key if provided
     if args.api_key:
         os.environ["OPENAI_API_KEY"] = args.api_key
@@ -1250,10 +2051,15 @@ def main():
         query = args.query
 
     if query:
-        asyncio.run(main_async(
+        # uvloop is not available on Windows; fall back to the default loop there
+        if uvloop is not None and sys.platform != "win32":
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+        asyncio.run(_main_with_pool(
             query,
             save_to_file=not args.no_save,
-            use_playwright=not args.simple_computer  # Note: changed from args.simple
+            use_playwright=not args.simple_computer,  # Note: changed from args.simple
+            strict=args.strict
         ))
     else:
         print("No query provided. Exiting.")
@@ -0,0 +1,46 @@
+"""Routing of simple queries to the task templates that skip the LLM."""
+import pytest
+
+# app imports the agents SDK, Playwright and the OpenAI client at module level
+app = pytest.importorskip("app")
+
+
+# Queries that must (intent) or must not (None) be routed to a template
+ROUTING_EXAMPLES = [
+    ("buy running shoes online", "price"),
+    ("where to buy cat food", "price"),
+    ("shop for organic eggs", "price"),
+    ("laptop deals under $1000", "price"),
+    ("best deals on wireless earbuds", "price"),
+    ("top 10 sci-fi books", "list"),
+    ("best 5 running shoes", "list"),
+    ("find prices for organic eggs", None),
+    ("stock prices", None),
+    ("house prices", None),
+    ("gas prices", None),
+    ("insurance costs", None),
+    ("buy stock", None),
+    ("best practices", None),
+    ("best friend gifts", None),
+    ("best time to visit Japan", None),
+    ("best way to learn python", None),
+    ("top stories today", None),
+    ("what is the cost of living in Paris", None),
+    ("best deals on tvs at Walmart", None),
+    ("search for cat food prices at pet stores", None),
+    ("laptop deals for students", None),
+
+]
+
+
+@pytest.mark.parametrize("query, intent", ROUTING_EXAMPLES)
+def test_template_routing(query, intent):
+    match = app._match_template(query)
+    assert (match[0] if match else None) == intent
+
+
+def test_price_qualifier_kept_out_of_topic():
+    intent, topic, qualifier = app._match_template("laptop deals under $1000")
+    task_config = app._TEMPLATE_BUILDERS[intent](topic, qualifier)
+    assert task_config["task_name"] == "Find laptop prices under $1000"
+    assert "buy laptop under $1000" in task_config["search_terms"]